@@ -12,6 +12,17 @@ ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
 MAX_ITERATIONS = int(os.getenv("MAX_ITERATIONS", "20"))
+# When the conversation grows past this many messages, the older half is
+# replaced by an LLM-written summary
+MAX_CONTEXT_MESSAGES = int(os.getenv("MAX_CONTEXT_MESSAGES", "40"))
+# Tool results longer than this are saved to the session's artifacts dir and
+# replaced in the conversation by a preview plus the file path
+MAX_TOOL_RESULT_CHARS = int(os.getenv("MAX_TOOL_RESULT_CHARS", "20000"))
+# User tools run in a pool of worker processes; calls past the timeout are killed
+TOOL_WORKERS = int(os.getenv("TOOL_WORKERS", "4"))
+TOOL_TIMEOUT_S = float(os.getenv("TOOL_TIMEOUT_S", "120"))
+# Include full tracebacks in tool error results sent back to the LLM
+DEBUG_TRACEBACKS = os.getenv("DEBUG_TRACEBACKS", "").lower() in ("1", "true", "yes")
 TOOLS_DIR = BASE_DIR / "tools"
 LOGS_DIR = BASE_DIR / "logs"
 LISTENERS_DIR = BASE_DIR / "listeners"
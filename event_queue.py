@@ -1,7 +1,8 @@
+import os
 import threading
-import queue
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import cached_property
 from typing import Any
 
 
@@ -14,32 +15,72 @@ class AgentEvent:
     payload: Any = field(compare=False, default=None)
     timestamp: str = field(compare=False, default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
+    @cached_property
+    def label(self) -> str:
+        """`source/event_type`, built once per event."""
+        return f"{self.source}/{self.event_type}"
+
 
 class EventQueue:
     """Thread-safe priority queue for external events."""
 
     def __init__(self):
-        self._queue: queue.PriorityQueue[AgentEvent] = queue.PriorityQueue()
+        # Unordered until drained; one stable sort on drain is cheaper than
+        # maintaining a heap and keeps FIFO order within a priority
+        self._pending: list[AgentEvent] = []
+        self._qlock = threading.Lock()
+        # Self-pipe that is readable while events are pending, so the main loop
+        # can block on it alongside stdin in a selector
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
         self._listeners: list = []
         self._lock = threading.Lock()
 
     def put(self, event: AgentEvent):
         """Add an event to the queue."""
-        self._queue.put(event)
+        with self._qlock:
+            if not self._pending:
+                self._notify()
+            self._pending.append(event)
 
     def get_all_pending(self) -> list[AgentEvent]:
         """Drain all pending events from the queue and return them sorted by priority."""
-        events = []
-        while True:
-            try:
-                events.append(self._queue.get_nowait())
-            except queue.Empty:
-                break
+        with self._qlock:
+            events, self._pending = self._pending, []
+            if events:
+                self._clear_notify()
+        events.sort()
         return events
 
+    def fileno(self) -> int:
+        """File descriptor that becomes readable when events are pending (for selectors)."""
+        return self._wake_r
+
+    def clear_wakeup(self):
+        """Consume the wake-up signal without draining events.
+
+        For event-loop readers that only need to know events arrived; the consumer
+        must check `has_pending()` before waiting again."""
+        with self._qlock:
+            self._clear_notify()
+
+    def _notify(self):
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass
+
+    def _clear_notify(self):
+        try:
+            while os.read(self._wake_r, 512):
+                pass
+        except BlockingIOError:
+            pass
+
     def has_pending(self) -> bool:
         """Check if there are pending events without consuming them."""
-        return not self._queue.empty()
+        return bool(self._pending)
 
     def register_listener(self, listener):
         """Register a listener to be started as a daemon thread."""
@@ -0,0 +1,49 @@
+"""JSON helpers that use orjson when it is installed and fall back to the stdlib."""
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 20+ digits may exceed 64 bits, which orjson silently parses as a float
+_WIDE_INT = re.compile(r"\d{20}")
+_WIDE_INT_BYTES = re.compile(rb"\d{20}")
+
+
+def dumps(obj, default=None) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes.
+
+    `default` is called for objects that aren't natively serializable. Inputs orjson
+    rejects (lone surrogates, ints wider than 64 bits) go through the stdlib instead."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    # ASCII escapes keep lone surrogates encodable
+    return json.dumps(obj, default=default, ensure_ascii=True).encode()
+
+
+def dumps_pretty(obj) -> str:
+    """Serialize to a 2-space indented JSON string."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2)
+
+
+def loads(data: str | bytes):
+    """Parse JSON. Inputs orjson rejects (NaN, out-of-range floats, lone surrogate
+    escapes) or would lose precision on (ints wider than 64 bits) go through the stdlib."""
+    if orjson is not None:
+        wide = _WIDE_INT_BYTES if isinstance(data, bytes) else _WIDE_INT
+        if not wide.search(data):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+    return json.loads(data)
@@ -2,7 +2,10 @@ from abc import ABC, abstractmethod
 
 
 class BaseListener(ABC):
-    """Base class for all event source listeners."""
+    """Base class for all event source listeners.
+
+    Listener modules in this package are discovered at startup and must export
+    their listener as a module-level `LISTENER_CLASS = MyListener`."""
 
     @property
     @abstractmethod
@@ -1,10 +1,37 @@
-import json
+import atexit
 import os
+import queue
+import threading
+import time
+import traceback
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 
 import config
+import jsonutil
+
+
+def truncate(s: str, n: int) -> str:
+    """Return `s` cut to `n` characters, marking the cut if one was made."""
+    if len(s) <= n:
+        return s
+    return s[:n] + "…(truncated)"
+
+
+class _LazyTraceback:
+    """Formats an exception's traceback only when serialized.
+
+    Log entries are serialized on the writer thread with `default=str`, so the
+    stack walk and source-line reads happen off the agent loop."""
+
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+    def __str__(self) -> str:
+        return "".join(traceback.format_exception(self.exc))
 
 
 class SessionLogger:
@@ -15,10 +42,30 @@ class SessionLogger:
         self.session_dir = config.LOGS_DIR / self.session_id
         self.session_dir.mkdir(parents=True, exist_ok=True)
         self.log_file = self.session_dir / "session.jsonl"
-        self._file = open(self.log_file, "a")
+        # Raw append-only fd: the writer thread is the only writer and batches
+        # itself, so Python's buffered file layer would only add locking
+        self._fd: int | None = os.open(
+            self.log_file,
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_CLOEXEC", 0),
+            0o644,
+        )
+        self._flush_threshold = 64 * 1024
+        self._closed = False
+        # Entries are handed to a daemon writer thread so serialization and
+        # disk I/O stay off the agent loop
+        self._q: queue.Queue[dict | None] = queue.Queue(maxsize=10000)
+        self._write_lock = threading.Lock()
+        self._writer_thread = threading.Thread(
+            target=self._writer, daemon=True, name="session-logger",
+        )
+        self._writer_thread.start()
         self.total_input_tokens = 0
         self.total_output_tokens = 0
         self._status_file = config.BASE_DIR / "agent_status.json"
+        self._status_interval = 0.1
+        self._last_status_ts = 0.0
+        self._last_status_payload: tuple[str, str | None] | None = None
+        atexit.register(self.close)
 
     def log(self, event_type: str, data: dict):
         entry = {
@@ -26,8 +73,62 @@ class SessionLogger:
             "event": event_type,
             **data,
         }
-        self._file.write(json.dumps(entry) + "\n")
-        self._file.flush()
+        try:
+            self._q.put_nowait(entry)
+        except queue.Full:
+            # Writer is falling behind — write directly rather than drop the entry
+            self._write([self._serialize(entry)])
+
+    @staticmethod
+    def _serialize(entry: dict) -> bytes:
+        # Runs on the writer thread: an exception here would kill it, so an
+        # entry that can't be serialized is replaced by a stub error line
+        try:
+            return jsonutil.dumps(entry, default=str) + b"\n"
+        except Exception as e:
+            stub = {
+                "timestamp": str(entry.get("timestamp", "")),
+                "event": "log_error",
+                "error": f"could not serialize {str(entry.get('event'))!r} entry: {e!r}",
+            }
+            return jsonutil.dumps(stub, default=repr) + b"\n"
+
+    def _writer(self):
+        """Drain the queue, batching lines up to the flush threshold per write."""
+        while True:
+            entry = self._q.get()
+            if entry is None:
+                return
+            line = self._serialize(entry)
+            batch = [line]
+            size = len(line)
+            stop = False
+            while size < self._flush_threshold:
+                try:
+                    entry = self._q.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                line = self._serialize(entry)
+                batch.append(line)
+                size += len(line)
+            self._write(batch)
+            if stop:
+                return
+
+    def _write(self, lines: list[bytes]):
+        with self._write_lock:
+            if self._fd is None:
+                return
+            view = memoryview(b"".join(lines))
+            try:
+                while view:
+                    written = os.write(self._fd, view)
+                    view = view[written:]
+            except OSError as e:
+                print(f"[warn] Failed to write session log: {e}")
 
     def log_user_message(self, content: str):
         self.log("user_message", {"content": content})
@@ -43,10 +144,7 @@ class SessionLogger:
         self.total_output_tokens += usage.get("output_tokens", 0)
         self.log("llm_response", {
             "content": content,
-            "tool_calls": [
-                {"id": tc.id, "name": tc.name, "arguments": tc.arguments}
-                for tc in tool_calls
-            ],
+            "tool_calls": [tc.to_log_dict() for tc in tool_calls],
             "usage": usage,
             "cumulative_usage": {
                 "input_tokens": self.total_input_tokens,
@@ -54,12 +152,24 @@ class SessionLogger:
             },
         })
 
-    def log_tool_exec(self, tool_name: str, arguments: dict, result: str):
-        self.log("tool_exec", {
+    def log_tool_exec(self, tool_name: str, arguments: dict, result: str, error: BaseException | None = None):
+        data = {
             "tool": tool_name,
             "arguments": arguments,
-            "result": result[:2000],
-        })
+            "result": truncate(result, 2000),
+        }
+        if error is not None:
+            data["error"] = str(error)
+            data["traceback"] = _LazyTraceback(error)
+        self.log("tool_exec", data)
+
+    def save_artifact(self, filename: str, content: str) -> Path:
+        """Write content to the session's artifacts directory and return its path."""
+        artifacts_dir = self.session_dir / "artifacts"
+        artifacts_dir.mkdir(exist_ok=True)
+        path = artifacts_dir / filename
+        path.write_text(content)
+        return path
 
     def log_external_event(self, source: str, event_type: str, payload: dict):
         self.log("external_event", {
@@ -72,7 +182,16 @@ class SessionLogger:
         self.log("error", {"error": error, "context": context})
 
     def update_status(self, state: str, current_tool: str | None = None):
-        """Write agent_status.json with current state."""
+        """Write agent_status.json with current state.
+
+        Repeats of the same state within `_status_interval` are skipped. The file is
+        replaced atomically so observers never read a partial write."""
+        payload = (state, current_tool)
+        now = time.monotonic()
+        if payload == self._last_status_payload and now - self._last_status_ts < self._status_interval:
+            return
+        self._last_status_payload = payload
+        self._last_status_ts = now
         status = {
             "state": state,
             "session_id": self.session_id,
@@ -80,13 +199,29 @@ class SessionLogger:
             "current_tool": current_tool,
             "pid": os.getpid(),
         }
+        tmp = self._status_file.with_suffix(".tmp")
         try:
-            self._status_file.write_text(json.dumps(status, indent=2))
+            tmp.write_text(jsonutil.dumps_pretty(status))
+            os.replace(tmp, self._status_file)
         except Exception:
             pass
 
     def close(self):
-        self._file.close()
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._q.put(None, timeout=2)
+        except queue.Full:
+            pass  # writer is wedged; don't hang shutdown (this also runs from atexit)
+        self._writer_thread.join(timeout=2)
+        with self._write_lock:
+            try:
+                os.fsync(self._fd)
+            except OSError:
+                pass
+            os.close(self._fd)
+            self._fd = None
         # Clean up status file on exit
         try:
             if self._status_file.exists():
@@ -1,11 +1,12 @@
-import json
-import select
+import asyncio
+import reprlib
 import sys
 from datetime import datetime, timezone
 
 import config
+import jsonutil
 from event_queue import AgentEvent, EventQueue
-from logger import SessionLogger
+from logger import SessionLogger, truncate
 from providers import get_provider, ToolResult
 from registry import ToolRegistry
 
@@ -27,48 +28,155 @@ Guidelines for creating tools:
 - Handle errors gracefully inside tool code.
 
 Available tools:
-{tool_list}
 """
 
+SUMMARY_PROMPT = """\
+You compress conversation history for an AI agent. Summarize the transcript you \
+are given: keep the user's goals and requests, decisions made, tools created or \
+used and their key results, and any open tasks. Be concise and factual.
+"""
+
+
+def build_system_prompt(schemas: tuple[dict, ...]) -> tuple[str, str]:
+    """Return the system prompt as (static preamble, tool list JSON).
+
+    Kept as two parts so providers can mark the tool list for prompt caching."""
+    tool_list = jsonutil.dumps_pretty(schemas)
+    return SYSTEM_PROMPT, tool_list
+
 
-def build_system_prompt(registry: ToolRegistry) -> str:
-    schemas = registry.get_schemas()
-    tool_list = json.dumps(schemas, indent=2)
-    return SYSTEM_PROMPT.format(tool_list=tool_list)
+MAX_EVENT_PAYLOAD_BYTES = 1024
 
 
 def format_event_as_input(event: AgentEvent) -> str:
     """Convert an AgentEvent into a natural-language string for the agent."""
-    p = event.payload
-    if isinstance(p, dict) and "text" in p:
-        return f"[{event.source}/{event.event_type}]: {p['text']}"
-    return f"[{event.source}/{event.event_type}]: {json.dumps(p)}"
+    match event.payload:
+        case {"text": text}:
+            body = str(text)
+        case str() as text:
+            body = text
+        case payload:
+            # Other payloads are embedded as JSON, capped so a large blob
+            # doesn't flood the prompt
+            raw = jsonutil.dumps(payload, default=str)
+            body = raw[:MAX_EVENT_PAYLOAD_BYTES].decode("utf-8", "ignore")
+            if len(raw) > MAX_EVENT_PAYLOAD_BYTES:
+                body += "…(truncated)"
+    return "".join(("[", event.label, "]: ", body))
+
+
+# Bounded repr for echoing tool arguments without serializing them in full
+_args_repr = reprlib.Repr()
+_args_repr.maxstring = 80
+_args_repr.maxother = 80
+_args_repr.maxlevel = 3
+
+
+def offload_large_result(result: str, filename: str, logger: SessionLogger) -> str:
+    """Keep oversized tool output out of the conversation history.
+
+    The full text goes to the session's artifacts dir; the LLM sees a preview and the path."""
+    limit = config.MAX_TOOL_RESULT_CHARS
+    if len(result) <= limit:
+        return result
+    path = logger.save_artifact(filename, result)
+    return (
+        f"{result[:limit]}\n…(truncated: {len(result)} chars total, "
+        f"full output saved to {path})"
+    )
+
+
+def is_user_turn(message: dict) -> bool:
+    """True for a plain user message (not a batch of tool results)."""
+    return message["role"] == "user" and isinstance(message["content"], str)
+
+
+async def compact_history(messages: list, provider, logger: SessionLogger) -> bool:
+    """Summarize the older half of `messages` once it exceeds MAX_CONTEXT_MESSAGES.
+
+    The cut is made at a user turn so tool calls stay paired with their results,
+    and the summary is folded into that turn so role ordering stays valid.
+    Returns False if the summary call failed."""
+    if len(messages) <= config.MAX_CONTEXT_MESSAGES:
+        return True
+    turns = [i for i, m in enumerate(messages) if i > 0 and is_user_turn(m)]
+    if not turns:
+        return True
+    cut = next((i for i in turns if i >= len(messages) // 2), turns[-1])
 
-
-def run_agent_loop(user_input: str, messages: list, registry: ToolRegistry, provider, logger: SessionLogger):
+    try:
+        transcript = jsonutil.dumps(messages[:cut], default=str).decode()
+        response = await provider.chat(
+            (SUMMARY_PROMPT, ""),
+            [{"role": "user", "content": transcript}],
+            (),
+        )
+    except Exception as e:
+        logger.log_error(str(e), "context_summary")
+        return False
+
+    kept = messages[cut]
+    messages[:cut + 1] = [{
+        "role": "user",
+        "content": f"<summary>\n{response.content}\n</summary>\n\n{kept['content']}",
+    }]
+    logger.log("context_summary", {"summarized_messages": cut, "summary": response.content})
+    print(f"\n[context] summarized {cut} earlier message(s)")
+    return True
+
+
+class StreamPrinter:
+    """Echo streamed LLM text to stdout as it arrives."""
+
+    def __init__(self):
+        self.started = False
+
+    def write(self, text: str):
+        if not self.started:
+            sys.stdout.write("\n")
+            self.started = True
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def end(self):
+        if self.started:
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+            self.started = False
+
+
+async def run_agent_loop(user_input: str, messages: list, registry: ToolRegistry, provider, logger: SessionLogger):
     logger.update_status("processing")
     messages.append({"role": "user", "content": user_input})
     logger.log_user_message(user_input)
 
+    # Only rebuilt when create_tool changes the registry mid-loop
+    prompt_version = -1
+    system_prompt = ("", "")
+    tools: tuple[dict, ...] = ()
+    # Raised after a failed summary so every iteration doesn't retry it
+    compact_after = config.MAX_CONTEXT_MESSAGES
+
     for iteration in range(config.MAX_ITERATIONS):
-        system_prompt = build_system_prompt(registry)
-        llm_messages = [{"role": "system", "content": system_prompt}] + messages
+        if registry.version != prompt_version:
+            tools = registry.get_schemas()
+            system_prompt = build_system_prompt(tools)
+            prompt_version = registry.version
 
-        tools = registry.get_schemas()
-        logger.log_llm_request(llm_messages, tools)
+        logger.log_llm_request(messages, tools)
 
+        printer = StreamPrinter()
         try:
-            response = provider.chat(llm_messages, tools)
+            response = await provider.chat(system_prompt, messages, tools, on_text=printer.write)
         except Exception as e:
+            printer.end()
             logger.log_error(str(e), "llm_call")
             print(f"\n[error] LLM call failed: {e}")
             return
+        printer.end()
 
         logger.log_llm_response(response.content, response.tool_calls, response.usage)
 
-        if response.content:
-            print(f"\n{response.content}")
-
         # No tool calls — done
         if not response.tool_calls:
             messages.append(provider.build_assistant_message(response))
@@ -76,19 +184,18 @@ def run_agent_loop(user_input: str, messages: list, registry: ToolRegistry, prov
 
         messages.append(provider.build_assistant_message(response))
 
-        # Execute each tool call
-        tool_results = []
-        for tc in response.tool_calls:
-            if tc.name == "think":
-                print(f"\n[think] {tc.arguments.get('thought', '')[:300]}")
-                result = registry.execute(tc.name, **tc.arguments)
-            else:
-                logger.update_status("tool_executing", current_tool=tc.name)
-                print(f"\n[tool] {tc.name}({json.dumps(tc.arguments, indent=2)[:200]}...)")
-                result = registry.execute(tc.name, **tc.arguments)
-                print(f"[result] {result[:300]}")
+        running = [tc.name for tc in response.tool_calls if tc.name != "think"]
+        if running:
+            logger.update_status("tool_executing", current_tool=", ".join(running))
+
+        # Run the tool calls concurrently; results keep the order of the calls
+        outcomes = await asyncio.gather(*(
+            execute_tool_call(tc, registry, logger) for tc in response.tool_calls
+        ))
 
-            logger.log_tool_exec(tc.name, tc.arguments, result)
+        tool_results = []
+        for tc, (result, error) in zip(response.tool_calls, outcomes):
+            logger.log_tool_exec(tc.name, tc.arguments, result, error)
             tool_results.append(ToolResult(tool_call_id=tc.id, name=tc.name, result=result))
 
         logger.update_status("processing")
@@ -99,44 +206,73 @@ def run_agent_loop(user_input: str, messages: list, registry: ToolRegistry, prov
         else:
             messages.append(result_messages)
 
+        if len(messages) > compact_after:
+            if await compact_history(messages, provider, logger):
+                compact_after = config.MAX_CONTEXT_MESSAGES
+            else:
+                compact_after = len(messages) + config.MAX_CONTEXT_MESSAGES // 2
+
     print("\n[warn] Max iterations reached.")
 
 
-def check_stdin_ready() -> bool:
-    """Non-blocking check if stdin has data ready to read."""
-    ready, _, _ = select.select([sys.stdin], [], [], 1.0)
-    return bool(ready)
+async def execute_tool_call(tc, registry: ToolRegistry, logger: SessionLogger) -> tuple[str, Exception | None]:
+    """Run one tool call. `think` is answered inline; real tools run in a worker thread."""
+    if tc.name == "think":
+        print(f"\n[think] {truncate(tc.arguments.get('thought', ''), 300)}")
+        return registry.run(tc.name, tc.arguments)
+
+    print(f"\n[tool] {tc.name}({truncate(_args_repr.repr(tc.arguments), 200)})")
+    result, error = await asyncio.to_thread(registry.run, tc.name, tc.arguments)
+    result = offload_large_result(result, f"{tc.name}_{tc.id}.txt", logger)
+    print(f"[result] {tc.name}: {truncate(result, 300)}")
+    return result, error
 
 
-def setup_listeners(event_queue: EventQueue):
-    """Discover and start any listener modules the agent has created."""
+def setup_listeners(event_queue: EventQueue, logger: SessionLogger):
+    """Discover and start any listener modules the agent has created.
+
+    Each module must expose its listener class as `LISTENER_CLASS`."""
     import importlib
     import pkgutil
+    from concurrent.futures import ThreadPoolExecutor
     import listeners as listeners_pkg
     from listeners.base import BaseListener
 
-    for finder, module_name, _ in pkgutil.iter_modules(listeners_pkg.__path__):
-        if module_name == "base":
-            continue
+    module_names = [
+        name for _, name, _ in pkgutil.iter_modules(listeners_pkg.__path__)
+        if name != "base"
+    ]
+    if not module_names:
+        return
+
+    def import_one(module_name: str):
         try:
-            mod = importlib.import_module(f"listeners.{module_name}")
-            for attr in dir(mod):
-                cls = getattr(mod, attr)
-                if (
-                    isinstance(cls, type)
-                    and issubclass(cls, BaseListener)
-                    and cls is not BaseListener
-                ):
-                    instance = cls()
-                    event_queue.register_listener(instance)
-                    print(f"[listener] {instance.name} enabled")
+            return importlib.import_module(f"listeners.{module_name}"), None
         except Exception as e:
+            return None, e
+
+    # Listener modules may have heavy top-level imports; load them in parallel
+    with ThreadPoolExecutor(max_workers=min(8, len(module_names))) as pool:
+        imported = list(pool.map(import_one, module_names))
+
+    for module_name, (mod, error) in zip(module_names, imported):
+        try:
+            if error is not None:
+                raise error
+            cls = getattr(mod, "LISTENER_CLASS", None)
+            if not (isinstance(cls, type) and issubclass(cls, BaseListener)):
+                raise TypeError("module does not define LISTENER_CLASS as a BaseListener subclass")
+            instance = cls()
+            event_queue.register_listener(instance)
+            print(f"[listener] {instance.name} enabled")
+        except Exception as e:
+            logger.log_error(str(e), f"listener_load:{module_name}")
             print(f"[warn] Failed to load listener '{module_name}': {e}")
 
     event_queue.start_listeners()
 
 
-def main():
+async def main():
     print("Agentic Loop — type 'quit' to exit\n")
 
     registry = ToolRegistry()
@@ -150,48 +286,92 @@ def main():
     print(f"Loaded {tool_count} tool(s) from disk")
     print(f"Session log: {logger.log_file}")
 
-    setup_listeners(event_queue)
+    setup_listeners(event_queue, logger)
     print()
 
     messages = []
     logger.update_status("idle")
 
+    # The fd callbacks only queue stdin lines and signal `wake`; pending events
+    # are drained and priority-sorted when the loop is ready to process them
+    lines: asyncio.Queue[str] = asyncio.Queue()
+    wake = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    stdin_fd = sys.stdin.fileno()
+
+    def on_stdin():
+        line = sys.stdin.readline()
+        if not line:  # EOF
+            loop.remove_reader(stdin_fd)
+        lines.put_nowait(line)
+        wake.set()
+
+    async def read_stdin_in_thread():
+        # Fallback for stdin the selector can't poll (e.g. redirected from a file)
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            lines.put_nowait(line)
+            wake.set()
+            if not line:  # EOF
+                return
+
+    def on_events():
+        event_queue.clear_wakeup()
+        wake.set()
+
+    stdin_task = None
+    try:
+        loop.add_reader(stdin_fd, on_stdin)
+    except OSError:  # epoll rejects regular files with EPERM
+        stdin_task = asyncio.create_task(read_stdin_in_thread())
+    loop.add_reader(event_queue.fileno(), on_events)
+
     try:
         while True:
-            # Check for external events first
+            # External events first, including any that arrived during the last run
             pending = event_queue.get_all_pending()
             if pending:
                 for event in pending:
                     formatted = format_event_as_input(event)
                     print(f"\n[event] {formatted}")
                     logger.log_external_event(event.source, event.event_type, event.payload)
-                    run_agent_loop(formatted, messages, registry, provider, logger)
+                    await run_agent_loop(formatted, messages, registry, provider, logger)
                     print()
                 logger.update_status("idle")
 
-            # Non-blocking stdin check
-            if check_stdin_ready():
-                try:
-                    user_input = sys.stdin.readline().strip()
-                except EOFError:
-                    break
+            if lines.empty():
+                wake.clear()
+                if not event_queue.has_pending():
+                    await wake.wait()
+                continue
+
+            line = lines.get_nowait()
+            if not line:  # EOF
+                break
+            user_input = line.strip()
+            if not user_input:
+                continue
+            if user_input.lower() in ("quit", "exit"):
+                break
+
+            await run_agent_loop(user_input, messages, registry, provider, logger)
+            logger.update_status("idle")
+            print()
 
-                if not user_input:
-                    continue
-                if user_input.lower() in ("quit", "exit"):
-                    break
-
-                run_agent_loop(user_input, messages, registry, provider, logger)
-                logger.update_status("idle")
-                print()
-
-    except KeyboardInterrupt:
-        print("\n\nGoodbye!")
     finally:
+        if stdin_task is None:
+            loop.remove_reader(stdin_fd)
+        else:
+            stdin_task.cancel()
+        loop.remove_reader(event_queue.fileno())
         event_queue.stop_listeners()
+        registry.close()
         logger.update_status("idle")
         logger.close()
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n\nGoodbye!")
@@ -1,12 +1,20 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCall:
     id: str
     name: str
     arguments: dict
+    _log_dict: dict | None = field(default=None, init=False, repr=False, compare=False)
+
+    def to_log_dict(self) -> dict:
+        """Session-log representation, built once per call."""
+        if self._log_dict is None:
+            self._log_dict = {"id": self.id, "name": self.name, "arguments": self.arguments}
+        return self._log_dict
 
 
 @dataclass
@@ -25,9 +33,40 @@ class LLMResponse:
 
 
 class BaseLLMProvider(ABC):
+    def __init__(self):
+        self._tools_cache: list[dict] = []
+        self._tools_cache_src: tuple[dict, ...] | None = None
+
     @abstractmethod
-    def chat(self, messages: list[dict], tools: list[dict]) -> LLMResponse:
-        """Send messages to the LLM and return a parsed response."""
+    def convert_tool(self, schema: dict) -> dict:
+        """Translate a registry tool schema into the provider-native tool format."""
+        ...
+
+    def get_provider_tools(self, tools: tuple[dict, ...]) -> list[dict]:
+        """Translate tool schemas, reusing the last result while given the same schemas.
+
+        The registry returns one tuple per version, so identity is enough
+        to tell when the catalog has changed. Tool-less calls (e.g. history
+        summaries) leave the cache alone."""
+        if not tools:
+            return []
+        if tools is not self._tools_cache_src:
+            self._tools_cache = [self.convert_tool(t) for t in tools]
+            self._tools_cache_src = tools
+        return self._tools_cache
+
+    @abstractmethod
+    async def chat(
+        self,
+        system: tuple[str, str],
+        messages: list[dict],
+        tools: tuple[dict, ...],
+        on_text: Callable[[str], None] | None = None,
+    ) -> LLMResponse:
+        """Stream a response from the LLM and return it once complete.
+
+        `system` is (preamble, tool list); the tool list only changes when a tool is created.
+        `on_text` is called with each text chunk as it arrives."""
         ...
 
     @abstractmethod
@@ -42,6 +81,23 @@ class BaseLLMProvider(ABC):
         ...
 
 
+_http_client = None
+
+
+def get_http_client():
+    """Shared pooled async HTTP client for all provider SDKs (HTTP/2 when `h2` is installed)."""
+    global _http_client
+    if _http_client is None:
+        import importlib.util
+        import httpx
+        _http_client = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        )
+    return _http_client
+
+
 def get_provider(name: str) -> BaseLLMProvider:
     if name == "anthropic":
         from providers.anthropic import AnthropicProvider
@@ -1,45 +1,65 @@
+from collections.abc import Callable
+
 import anthropic
 
 import config
-from providers import BaseLLMProvider, LLMResponse, ToolCall, ToolResult
+from providers import BaseLLMProvider, LLMResponse, ToolCall, ToolResult, get_http_client
 
 
 class AnthropicProvider(BaseLLMProvider):
     def __init__(self):
-        self.client = anthropic.Anthropic(api_key=config.ANTHROPIC_API_KEY)
+        super().__init__()
+        self.client = anthropic.AsyncAnthropic(
+            api_key=config.ANTHROPIC_API_KEY,
+            http_client=get_http_client(),
+        )
         self.model = config.get_model()
 
-    def chat(self, messages: list[dict], tools: list[dict]) -> LLMResponse:
+    def convert_tool(self, schema: dict) -> dict:
+        return {
+            "name": schema["name"],
+            "description": schema["description"],
+            "input_schema": schema["parameters"],
+        }
+
+    async def chat(
+        self,
+        system: tuple[str, str],
+        messages: list[dict],
+        tools: tuple[dict, ...],
+        on_text: Callable[[str], None] | None = None,
+    ) -> LLMResponse:
         # Convert tool schemas to Anthropic format
-        anthropic_tools = [
-            {
-                "name": t["name"],
-                "description": t["description"],
-                "input_schema": t["parameters"],
-            }
-            for t in tools
-        ]
+        anthropic_tools = self.get_provider_tools(tools)
 
-        # Separate system message from conversation messages
-        system = ""
-        api_messages = []
-        for msg in messages:
-            if msg["role"] == "system":
-                system = msg["content"]
-            else:
-                api_messages.append(msg)
+        # Mark the tool list as the cache breakpoint so tools + system prompt
+        # are served from Anthropic's prompt cache between turns
+        preamble, tool_list = system
+        system_blocks = []
+        if preamble:
+            system_blocks.append({"type": "text", "text": preamble})
+        if tool_list:
+            system_blocks.append({
+                "type": "text",
+                "text": tool_list,
+                "cache_control": {"type": "ephemeral"},
+            })
 
         kwargs = {
             "model": self.model,
             "max_tokens": 4096,
-            "messages": api_messages,
+            "messages": messages,
         }
-        if system:
-            kwargs["system"] = system
+        if system_blocks:
+            kwargs["system"] = system_blocks
         if anthropic_tools:
             kwargs["tools"] = anthropic_tools
 
-        response = self.client.messages.create(**kwargs)
+        async with self.client.messages.stream(**kwargs) as stream:
+            async for text in stream.text_stream:
+                if on_text:
+                    on_text(text)
+            response = await stream.get_final_message()
 
         # Parse response
         content = ""
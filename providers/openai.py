@@ -1,80 +1,133 @@
-import json
-from openai import OpenAI
+import itertools
+from collections.abc import Callable
+
+from openai import AsyncOpenAI
 
 import config
-from providers import BaseLLMProvider, LLMResponse, ToolCall, ToolResult
+import jsonutil
+from providers import BaseLLMProvider, LLMResponse, ToolCall, ToolResult, get_http_client
 
 
 class OpenAIProvider(BaseLLMProvider):
     def __init__(self):
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
+        super().__init__()
+        self.client = AsyncOpenAI(
+            api_key=config.OPENAI_API_KEY,
+            http_client=get_http_client(),
+        )
         self.model = config.get_model()
+        self._system_src: tuple[str, str] | None = None
+        self._system_msg: dict | None = None
+
+    def convert_tool(self, schema: dict) -> dict:
+        return {
+            "type": "function",
+            "function": {
+                "name": schema["name"],
+                "description": schema["description"],
+                "parameters": schema["parameters"],
+            },
+        }
 
-    def chat(self, messages: list[dict], tools: list[dict]) -> LLMResponse:
+    async def chat(
+        self,
+        system: tuple[str, str],
+        messages: list[dict],
+        tools: tuple[dict, ...],
+        on_text: Callable[[str], None] | None = None,
+    ) -> LLMResponse:
         # Convert tool schemas to OpenAI function calling format
-        openai_tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": t["name"],
-                    "description": t["description"],
-                    "parameters": t["parameters"],
-                },
-            }
-            for t in tools
-        ]
+        openai_tools = self.get_provider_tools(tools)
+
+        # OpenAI caches stable prompt prefixes automatically, so a single
+        # system message is enough. The agent prompt's message is built once
+        # and chained in front of the history rather than copying the list.
+        if system is self._system_src:
+            system_msg = self._system_msg
+        else:
+            system_content = "".join(system)
+            system_msg = {"role": "system", "content": system_content} if system_content else None
+            # Only the agent prompt (which carries the tool list) is worth keeping;
+            # one-off prompts such as history summaries must not evict it
+            if system[1]:
+                self._system_src, self._system_msg = system, system_msg
+        if system_msg:
+            api_messages = itertools.chain((system_msg,), messages)
+        else:
+            api_messages = messages
 
         kwargs = {
             "model": self.model,
-            "messages": messages,
+            "messages": api_messages,
+            "stream": True,
+            "stream_options": {"include_usage": True},
         }
         if openai_tools:
             kwargs["tools"] = openai_tools
 
-        response = self.client.chat.completions.create(**kwargs)
-
-        choice = response.choices[0]
-        content = choice.message.content or ""
-        tool_calls = []
+        content_parts = []
+        partial_calls: dict[int, dict] = {}  # delta index -> accumulated tool call
+        usage = {}
+        stream = await self.client.chat.completions.create(**kwargs)
+        async for chunk in stream:
+            if chunk.usage:
+                usage = {
+                    "input_tokens": chunk.usage.prompt_tokens,
+                    "output_tokens": chunk.usage.completion_tokens,
+                }
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                content_parts.append(delta.content)
+                if on_text:
+                    on_text(delta.content)
+            for tc in delta.tool_calls or ():
+                call = partial_calls.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+                if tc.id:
+                    call["id"] = tc.id
+                if tc.function:
+                    if tc.function.name:
+                        call["name"] += tc.function.name
+                    if tc.function.arguments:
+                        call["arguments"] += tc.function.arguments
 
-        if choice.message.tool_calls:
-            for tc in choice.message.tool_calls:
-                tool_calls.append(ToolCall(
-                    id=tc.id,
-                    name=tc.function.name,
-                    arguments=json.loads(tc.function.arguments),
-                ))
+        content = "".join(content_parts)
+        calls = [partial_calls[i] for i in sorted(partial_calls)]
+        tool_calls = [
+            ToolCall(
+                id=c["id"],
+                name=c["name"],
+                arguments=jsonutil.loads(c["arguments"] or "{}"),
+            )
+            for c in calls
+        ]
 
-        usage = {}
-        if response.usage:
-            usage = {
-                "input_tokens": response.usage.prompt_tokens,
-                "output_tokens": response.usage.completion_tokens,
-            }
+        # Streaming has no final message object, so keep the assembled
+        # assistant message for conversation history instead
+        assistant_message = {"role": "assistant", "content": content or None}
+        if calls:
+            assistant_message["tool_calls"] = [
+                {
+                    "id": c["id"],
+                    "type": "function",
+                    "function": {
+                        "name": c["name"],
+                        "arguments": c["arguments"],
+                    },
+                }
+                for c in calls
+            ]
 
         return LLMResponse(
             content=content,
             tool_calls=tool_calls,
             usage=usage,
-            raw_response=response,
+            raw_response=assistant_message,
         )
 
     def build_assistant_message(self, response: LLMResponse) -> dict:
-        msg = response.raw_response.choices[0].message
-        result = {"role": "assistant", "content": msg.content}
-        if msg.tool_calls:
-            result["tool_calls"] = [
-                {
-                    "id": tc.id,
-                    "type": "function",
-                    "function": {
-                        "name": tc.function.name,
-                        "arguments": tc.function.arguments,
-                    },
-                }
-                for tc in msg.tool_calls
-            ]
-        return result
+        return response.raw_response
 
     def build_tool_results_message(self, results: list[ToolResult]) -> dict | list[dict]:
         # OpenAI uses one message per tool result
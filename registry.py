@@ -1,12 +1,23 @@
 import importlib
+import importlib.metadata
 import json
+import multiprocessing
+import re
+import shutil
 import subprocess
 import sys
+import threading
 import traceback
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 import config
 
+# uv resolves and installs far faster than pip; use it when it's on PATH
+_UV = shutil.which("uv")
+_BARE_REQUIREMENT = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
 
 THINK_SCHEMA = {
     "name": "think",
@@ -72,9 +83,133 @@ CREATE_TOOL_SCHEMA = {
 }
 
 
+def _is_installed(requirement: str) -> bool:
+    """True if a bare package name is already installed. Requirements with
+    version specifiers, extras or markers are left for the installer to resolve."""
+    if not _BARE_REQUIREMENT.match(requirement):
+        return False
+    try:
+        importlib.metadata.version(requirement)
+        return True
+    except importlib.metadata.PackageNotFoundError:
+        return False
+
+
+def install_dependencies(requirements: list[str]):
+    """Install any requirements that aren't already satisfied."""
+    requirements = [r.strip() for r in requirements if r.strip()]
+    missing = [r for r in requirements if not _is_installed(r)]
+    if not missing:
+        return
+    if _UV:
+        cmd = [_UV, "pip", "install", "--python", sys.executable, *missing]
+    else:
+        cmd = [sys.executable, "-m", "pip", "install", *missing]
+    subprocess.check_call(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def _preimport_tools(module_names: list[str]):
+    """Worker initializer: import every tool module up front so calls don't pay for it."""
+    for module_name in module_names:
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            pass  # surfaces as an error when the tool is actually called
+
+
+def _run_tool(module_name: str, arguments: dict) -> str:
+    """Executed in a worker process."""
+    return str(importlib.import_module(module_name).execute(**arguments))
+
+
+def _noop():
+    pass
+
+
+class _ToolPool:
+    """Worker processes for user tools, each with every tool module pre-imported."""
+
+    def __init__(self, module_names: list[str]):
+        # spawn rather than fork: the agent process has logger and listener threads
+        self.executor = ProcessPoolExecutor(
+            max_workers=config.TOOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_preimport_tools,
+            initargs=(module_names,),
+        )
+        # One no-op per worker makes the pool start and initialize all of them now
+        self._warmup = [self.executor.submit(_noop) for _ in range(config.TOOL_WORKERS)]
+        self._inflight: set[Future] = set()
+        self._processes: list = []  # last known workers, kept past shutdown()
+        self._lock = threading.Lock()
+
+    def submit(self, module_name: str, arguments: dict) -> Future:
+        # Warm-up is not charged against the call's deadline
+        wait(self._warmup)
+        future = self.executor.submit(_run_tool, module_name, arguments)
+        with self._lock:
+            self._inflight.add(future)
+            self._snapshot_processes()
+        future.add_done_callback(self._discard)
+        return future
+
+    def _discard(self, future: Future):
+        with self._lock:
+            self._inflight.discard(future)
+
+    def _snapshot_processes(self):
+        # ProcessPoolExecutor has no public handle on its workers. Reading the private
+        # `_processes` is deliberate: it is the only way to terminate a worker stuck in a
+        # call, and it is copied here because shutdown() clears it.
+        processes = self.executor._processes
+        if processes is not None:
+            self._processes = list(processes.values())
+
+    @property
+    def busy(self) -> bool:
+        with self._lock:
+            return bool(self._inflight)
+
+    def shutdown(self):
+        """Stop accepting calls; workers exit once in-flight calls finish."""
+        with self._lock:
+            self._snapshot_processes()
+        self.executor.shutdown(wait=False)
+
+    def kill(self, stuck: Future | None = None):
+        """Stop the workers now, cancelling pending calls.
+
+        When one is `stuck` on a call, other calls already running get up to
+        TOOL_TIMEOUT_S to finish first, since a worker dying breaks the whole pool."""
+        with self._lock:
+            self._snapshot_processes()
+            others = self._inflight - {stuck}
+        if stuck is not None:
+            wait(others, timeout=config.TOOL_TIMEOUT_S)
+        # A running call can't be cancelled, so stop the workers outright
+        for process in self._processes:
+            process.terminate()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def format_error(e: BaseException) -> str:
+    """One-line summary of an exception, plus the traceback if DEBUG_TRACEBACKS is set."""
+    summary = "".join(traceback.format_exception_only(type(e), e)).strip()
+    if config.DEBUG_TRACEBACKS:
+        return f"{summary}\n{''.join(traceback.format_exception(e))}"
+    return summary
+
+
 class ToolRegistry:
     def __init__(self):
-        self._tools: dict[str, dict] = {}  # name -> {"manifest": ..., "module": ...}
+        self._tools: dict[str, dict] = {}  # name -> {"manifest": ..., "module": ..., "schema": ...}
+        self._version = 0  # bumped on every registration
+        self._schemas: tuple[dict, ...] | None = None  # rebuilt lazily after a registration
+        # Worker processes that run user tools, isolated from the agent loop.
+        # Started after loading or creating tools and retired whenever the set changes.
+        self._pool: _ToolPool | None = None
+        self._draining: list[_ToolPool] = []  # retired pools that may still be running calls
+        self._pool_lock = threading.Lock()
         self._ensure_tools_dir()
 
     def _ensure_tools_dir(self):
@@ -98,42 +233,113 @@ class ToolRegistry:
                 if not init_file.exists():
                     continue
                 module = importlib.import_module(f"tools.{tool_dir.name}")
-                self._tools[manifest["name"]] = {
-                    "manifest": manifest,
-                    "module": module,
-                }
+                self.register(manifest["name"], manifest, module)
             except Exception:
                 print(f"[warn] Failed to load tool '{tool_dir.name}': {traceback.format_exc()}")
+        if self._tools:
+            self._get_pool()
 
     def register(self, name: str, manifest: dict, module):
-        self._tools[name] = {"manifest": manifest, "module": module}
+        schema = {
+            "name": manifest["name"],
+            "description": manifest["description"],
+            "parameters": manifest["parameters"],
+        }
+        self._tools[name] = {"manifest": manifest, "module": module, "schema": schema}
+        self._version += 1
+        self._schemas = None
+        self._retire_pool()
+
+    def _get_pool(self) -> _ToolPool:
+        with self._pool_lock:
+            if self._pool is None:
+                module_names = [entry["module"].__name__ for entry in self._tools.values()]
+                self._pool = _ToolPool(module_names)
+            return self._pool
+
+    def _retire_pool(self, pool: _ToolPool | None = None, stuck: Future | None = None):
+        """Detach `pool` (default: the current one) if it is still current and shut it
+        down, killing its workers if a call is `stuck` on it."""
+        with self._pool_lock:
+            if pool is None:
+                pool = self._pool
+            if pool is None:
+                return
+            if self._pool is pool:
+                self._pool = None
+            if stuck is None:
+                # Remember pools still draining calls so close() can stop them too
+                self._draining = [p for p in self._draining if p.busy]
+                self._draining.append(pool)
+        if stuck is not None:
+            pool.kill(stuck)
+        else:
+            pool.shutdown()
+
+    def close(self):
+        """Stop every tool worker now, abandoning calls still running (e.g. on Ctrl-C)."""
+        with self._pool_lock:
+            pools = [p for p in (self._pool, *self._draining) if p is not None]
+            self._pool, self._draining = None, []
+        for pool in pools:
+            pool.kill()
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever the set of tools changes."""
+        return self._version
 
     def execute(self, name: str, **kwargs) -> str:
+        return self.run(name, kwargs)[0]
+
+    def run(self, name: str, arguments: dict) -> tuple[str, Exception | None]:
+        """Execute a tool and return (result, exception raised by the tool, if any)."""
         if name == "think":
-            return kwargs.get("thought", "")
+            return arguments.get("thought", ""), None
         if name == "create_tool":
-            return self.create_tool(**kwargs)
+            return self._create_tool(**arguments)
 
         entry = self._tools.get(name)
         if not entry:
-            return f"Error: tool '{name}' not found"
+            return f"Error: tool '{name}' not found", None
+        pool = self._get_pool()
+        try:
+            try:
+                future = pool.submit(entry["module"].__name__, arguments)
+            except RuntimeError:
+                # Retired by a concurrent create_tool, or broken by a crashed worker
+                self._retire_pool(pool)
+                pool = self._get_pool()
+                future = pool.submit(entry["module"].__name__, arguments)
+        except RuntimeError as e:  # the replacement is broken too (BrokenProcessPool)
+            self._retire_pool(pool)
+            return f"Error executing tool '{name}': {format_error(e)}", e
         try:
-            result = entry["module"].execute(**kwargs)
-            return str(result)
+            return future.result(timeout=config.TOOL_TIMEOUT_S), None
         except Exception as e:
-            return f"Error executing tool '{name}': {e}\n{traceback.format_exc()}"
-
-    def get_schemas(self) -> list[dict]:
-        schemas = [THINK_SCHEMA, CREATE_TOOL_SCHEMA]
-        for entry in self._tools.values():
-            m = entry["manifest"]
-            schema = {
-                "name": m["name"],
-                "description": m["description"],
-                "parameters": m["parameters"],
-            }
-            schemas.append(schema)
-        return schemas
+            # A TimeoutError from a finished future was raised by the tool itself
+            if isinstance(e, TimeoutError) and not future.done():
+                self._retire_pool(pool, stuck=future)
+                self._get_pool()  # warm a replacement for later calls
+                return (
+                    f"Error executing tool '{name}': timed out after {config.TOOL_TIMEOUT_S}s "
+                    "and its worker process was stopped",
+                    e,
+                )
+            if isinstance(e, BrokenProcessPool):
+                self._retire_pool(pool)
+            return f"Error executing tool '{name}': {format_error(e)}", e
+
+    def get_schemas(self) -> tuple[dict, ...]:
+        """Return tool schemas. The same tuple is returned until a tool is registered;
+        callers must not mutate the dicts."""
+        if self._schemas is None:
+            self._schemas = (
+                THINK_SCHEMA,
+                CREATE_TOOL_SCHEMA,
+                *(entry["schema"] for entry in self._tools.values()),
+            )
+        return self._schemas
 
     def has(self, name: str) -> bool:
         return name in self._tools or name in ("create_tool", "think")
@@ -147,6 +353,18 @@ class ToolRegistry:
         dependencies: list[str] | None = None,
         tags: list[str] | None = None,
     ) -> str:
+        return self._create_tool(tool_name, description, parameters, code, dependencies, tags)[0]
+
+    def _create_tool(
+        self,
+        tool_name: str,
+        description: str,
+        parameters: dict,
+        code: str,
+        dependencies: list[str] | None = None,
+        tags: list[str] | None = None,
+    ) -> tuple[str, Exception | None]:
+        """create_tool() that also returns the exception on failure, for the session log."""
         tool_dir = config.TOOLS_DIR / tool_name
         try:
             # 1. Create directory
@@ -169,11 +387,7 @@ class ToolRegistry:
             if dependencies:
                 req_file = tool_dir / "requirements.txt"
                 req_file.write_text("\n".join(dependencies) + "\n")
-                subprocess.check_call(
-                    [sys.executable, "-m", "pip", "install", "-r", str(req_file)],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                )
+                install_dependencies(dependencies)
 
             # 5. Import and register
             importlib.invalidate_caches()
@@ -182,7 +396,8 @@ class ToolRegistry:
                 del sys.modules[mod_name]
             module = importlib.import_module(mod_name)
             self.register(tool_name, manifest, module)
+            self._get_pool()  # start warming the replacement pool now
 
-            return f"Tool '{tool_name}' created and registered successfully."
+            return f"Tool '{tool_name}' created and registered successfully.", None
         except Exception as e:
-            return f"Failed to create tool '{tool_name}': {e}\n{traceback.format_exc()}"
+            return f"Failed to create tool '{tool_name}': {format_error(e)}", e